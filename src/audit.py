@@ -1,63 +1,199 @@
 # src/audit.py
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
 from sqlmodel import Session
-from models import AuditLog
-from typing import Optional, Dict, Any
+from models import AuditAction, AuditLog
+from db import get_session
+from typing import Optional, Dict, Any, List, Union
 from fastapi import Request
 
+# Pending audit entries, written in batches by the background writer
+audit_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+AUDIT_BATCH_SIZE = 256
+AUDIT_FLUSH_INTERVAL = 0.05  # seconds to wait for a batch to fill up
+AUDIT_WRITE_RETRIES = 3  # extra attempts for transient errors (database is locked)
+AUDIT_RETRY_BACKOFF = 0.1  # seconds before the first retry, doubled each time
+
+_writer_thread: Optional[threading.Thread] = None
+
+# Failures are logged through a queue so the write to stderr happens on the
+# listener thread, not in the request that hit the error
+logger = logging.getLogger("audit")
+_log_listener: Optional[QueueListener] = None
+
+
 def log_action(
-    session: Session,
-    action: str,
+    session: Optional[Session] = None,
+    *,
+    action: Union[AuditAction, str],
     user_id: Optional[int] = None,
     entity_type: Optional[str] = None,
     entity_id: Optional[int] = None,
     details: Optional[Dict[str, Any]] = None,
+    details_json: Optional[bytes] = None,
     ip_address: Optional[str] = None
 ):
     """
     Create an audit log entry for an action.
-    
+
+    Without a session the entry is queued and written by the background
+    writer, keeping the insert and its commit off the request path; queue it
+    only after the change it describes has been committed. With a session
+    the entry is added to it and persisted by the caller's commit.
+
     Args:
-        session: Database session
-        action: Action name (e.g., "create_user", "recognize", "redeem")
+        session: Optional database session to write the entry with
+        action: AuditAction, or its name (e.g., "create_user", "recognize", "redeem")
         user_id: ID of user who performed the action
         entity_type: Type of entity affected (e.g., "user", "recognition")
         entity_id: ID of the affected entity
         details: Additional context as a dictionary
+        details_json: Additional context already serialized to JSON; stored
+            as-is instead of details (e.g. large payloads built with orjson)
         ip_address: IP address of the requester
     """
     try:
-        audit_entry = AuditLog(
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details or {},
-            ip_address=ip_address
-        )
-        session.add(audit_entry)
-        session.flush()  # flush to ensure it's written even if parent transaction fails later
-    except Exception as e:
+        action = AuditAction.parse(action)
+    except ValueError:
+        # Checked here so a bad entry can't fail a whole queued batch
+        logger.exception("Audit logging failed")
+        return
+    entry = {
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "details": details_json if details_json is not None else (details or {}),
+        "ip_address": ip_address,
+        "ts": datetime.utcnow(),
+    }
+    if session is None:
+        audit_queue.put_nowait(entry)
+        return
+
+    try:
+        # No flush: the entry is written by the caller's single commit, so it
+        # is persisted atomically with the change it describes
+        session.add(AuditLog(**entry))
+    except Exception:
         # Don't let audit logging failure break the main operation
-        # In production, you'd want to log this error to a monitoring system
-        print(f"Audit logging failed: {e}")
+        logger.exception("Audit logging failed")
+
+
+def _insert(rows: List[Dict[str, Any]]):
+    """Insert rows in one transaction, retrying transient OperationalErrors."""
+    delay = AUDIT_RETRY_BACKOFF
+    for attempt in range(AUDIT_WRITE_RETRIES + 1):
+        try:
+            with get_session() as s:
+                s.execute(insert(AuditLog), rows)
+                s.commit()
+            return
+        except OperationalError:
+            if attempt == AUDIT_WRITE_RETRIES:
+                raise
+            time.sleep(delay)
+            delay *= 2
+
+
+def _log_entry_failure(entry: Dict[str, Any]):
+    logger.exception(
+        "Audit logging failed for a %s entry by user %s", entry.get("action"), entry.get("user_id")
+    )
+
+
+def _write_batch(batch: List[Dict[str, Any]]):
+    """
+    Insert a batch of queued audit entries in a single transaction.
+
+    If the batch still fails after retries, its entries are inserted one by
+    one so a single bad entry (e.g. details orjson can't encode) doesn't
+    take the rest of the audit trail down with it.
+    """
+    try:
+        _insert(batch)
+        return
+    except Exception:
+        if len(batch) == 1:
+            _log_entry_failure(batch[0])
+            return
+        logger.exception("Audit logging failed for a batch of %d entries; retrying one by one", len(batch))
+    for entry in batch:
+        try:
+            _insert([entry])
+        except Exception:
+            _log_entry_failure(entry)
+
+
+def _audit_writer():
+    """Drain the audit queue until the stop sentinel (None) is received."""
+    while True:
+        entry = audit_queue.get()
+        if entry is None:
+            return
+        batch = [entry]
+        deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+        while len(batch) < AUDIT_BATCH_SIZE:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                entry = audit_queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if entry is None:
+                _write_batch(batch)
+                return
+            batch.append(entry)
+        _write_batch(batch)
+
+
+def start_audit_writer():
+    """Start the background audit writer and error log listener (no-op if running)."""
+    global _writer_thread, _log_listener
+    if _log_listener is None:
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+        logger.propagate = False
+        _log_listener = QueueListener(log_queue, logging.StreamHandler())
+        _log_listener.start()
+    if _writer_thread is not None and _writer_thread.is_alive():
+        return
+    _writer_thread = threading.Thread(target=_audit_writer, name="audit-writer", daemon=True)
+    _writer_thread.start()
+
+
+def stop_audit_writer():
+    """Write any queued audit entries, then stop the writer and log listener."""
+    global _writer_thread, _log_listener
+    if _writer_thread is not None:
+        audit_queue.put(None)
+        _writer_thread.join()
+        _writer_thread = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in [h for h in logger.handlers if isinstance(h, QueueHandler)]:
+            logger.removeHandler(handler)
+        logger.propagate = True
+        _log_listener = None
+
 
 def get_client_ip(request: Request) -> Optional[str]:
     """
     Extract client IP address from request, handling proxies.
     """
-    # Check for forwarded IP (behind proxy/load balancer)
-    forwarded = request.headers.get("X-Forwarded-For")
+    headers = request.headers
+    # Check for forwarded IP (behind proxy/load balancer); the first entry is
+    # the original client
+    forwarded = headers.get("x-forwarded-for")
     if forwarded:
-        return forwarded.split(",")[0].strip()
+        return forwarded.partition(",")[0].strip()
     
-    # Check for real IP header
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip
-    
-    # Fall back to direct client
-    if request.client:
-        return request.client.host
-    
-    return None
-
+    # Check for real IP header, then fall back to direct client
+    return headers.get("x-real-ip") or (request.client.host if request.client else None)
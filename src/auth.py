@@ -1,25 +1,48 @@
 # src/auth.py
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from cachetools import TTLCache
+import jwt
+from jwt import InvalidTokenError as JWTError
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import bindparam
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select
 from models import User
-from db import get_session
+from db import SessionLocal
 
 # JWT Configuration
 SECRET_KEY = "your-secret-key-change-in-production-use-env-variable"  # TODO: Move to environment variable
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 24 hours
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: argon2id for new hashes. bcrypt hashes from before the
+# switch still verify and are replaced on the next successful login.
+_password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=2)
+_BCRYPT_PREFIX = "$2"
+# bcrypt only ever used the first 72 bytes; bcrypt>=5 raises on longer input
+_BCRYPT_MAX_BYTES = 72
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Verified token payloads keyed by a digest of the raw token
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=60)
+# Column values of recently authenticated users keyed by user id
+_USER_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# cachetools caches are not thread-safe and sync handlers run in a threadpool
+_cache_lock = threading.Lock()
+
+# Login lookup, built once and bound per call
+_STMT_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -51,6 +74,9 @@ def verify_token(token: str) -> dict:
     """
     Verify and decode a JWT token.
     
+    Successfully verified payloads are cached briefly so repeated requests
+    with the same bearer token skip signature verification.
+    
     Args:
         token: JWT token string
     
@@ -60,36 +86,53 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _cache_lock:
+        payload = _TOKEN_CACHE.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Could not validate credentials: {str(e)}",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    with _cache_lock:
+        _TOKEN_CACHE[key] = payload
+    return payload
 
 
 def get_db_session():
-    """Dependency to get database session for FastAPI."""
-    with get_session() as session:
+    """
+    Dependency to get database session for FastAPI.
+    
+    FastAPI caches dependencies per request, so get_current_user and the
+    route handler share this session (and its transaction).
+    """
+    session = SessionLocal()
+    try:
         yield session
+    finally:
+        session.close()
 
-def get_current_user(
+def get_current_user_claims(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-) -> User:
+) -> dict:
     """
-    Dependency to get the current authenticated user from JWT token.
+    Dependency to get the verified JWT claims without loading the user.
     
     Args:
         credentials: HTTP Authorization credentials with Bearer token
     
     Returns:
-        Authenticated User object
+        Decoded token payload with a valid "sub" (user ID) claim
     
     Raises:
-        HTTPException: If authentication fails
+        HTTPException: If the token is invalid or has no usable user ID
     """
     token = credentials.credentials
     payload = verify_token(token)
@@ -104,7 +147,7 @@ def get_current_user(
         )
     
     try:
-        user_id = int(user_id_str)
+        int(user_id_str)
     except (ValueError, TypeError):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -112,60 +155,119 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Fetch user from database
-    with get_session() as session:
-        user = session.get(User, user_id)
-        if user is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
-        # Detach from session to use outside context
-        session.expunge(user)
+    return payload
+
+
+def get_current_user(
+    claims: dict = Depends(get_current_user_claims),
+    session: Session = Depends(get_db_session),
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
     
+    User rows are cached for a few seconds; balances on the returned object
+    may be stale, so handlers must re-read them from the database.
+    
+    Args:
+        claims: Verified JWT claims
+        session: Request-scoped database session
+    
+    Returns:
+        Authenticated User object (detached when served from the cache)
+    
+    Raises:
+        HTTPException: If authentication fails
+    """
+    user_id = int(claims["sub"])
+    
+    with _cache_lock:
+        cached = _USER_CACHE.get(user_id)
+    
+    if cached is not None:
+        # Rebuild the row from the cache as a detached instance. It is not
+        # added to the session: its possibly stale values would otherwise
+        # shadow fresh rows in the identity map for the rest of the request.
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return user
+    
+    # Fetch user from database
+    user = session.get(User, user_id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    with _cache_lock:
+        _USER_CACHE[user_id] = user.model_dump()
     return user
 
 
 def get_current_admin_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    claims: dict = Depends(get_current_user_claims)
+) -> dict:
     """
     Dependency to require admin role.
     
+    The role claim is signed into the token at login, so non-admins are
+    rejected without touching the database.
+    
     Args:
-        current_user: Current authenticated user
+        claims: Verified JWT claims
     
     Returns:
-        User object if admin
+        Token claims ("sub", "role", "email", "name") if admin
     
     Raises:
         HTTPException: If user is not admin
     """
-    # Check if user has admin role (user_id == 1 for demo, or use a role field)
-    if current_user.id != 1:
+    if claims.get("role") != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
         )
-    return current_user
+    return claims
 
 
 def hash_password(password: str) -> str:
     """Hash a password for storing."""
-    return pwd_context.hash(password)
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a stored password against one provided by user."""
-    return pwd_context.verify(plain_password, hashed_password)
+    if hashed_password.startswith(_BCRYPT_PREFIX):
+        try:
+            # Legacy passlib hashes of long passwords were made from the
+            # truncated bytes, so truncate the same way to verify them
+            return bcrypt.checkpw(
+                plain_password.encode()[:_BCRYPT_MAX_BYTES], hashed_password.encode()
+            )
+        except ValueError:
+            return False
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash uses bcrypt or outdated argon2 parameters."""
+    return (
+        hashed_password.startswith(_BCRYPT_PREFIX)
+        or _password_hasher.check_needs_rehash(hashed_password)
+    )
 
 
 def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
     
+    Hashing is CPU-bound, so async callers should run this in a threadpool.
+    If the stored hash needs upgrading it is replaced on the user object;
+    the caller's commit persists the upgrade.
+    
     Args:
         session: Database session
         email: User's email
@@ -174,7 +276,7 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
     Returns:
         User object if authentication successful, None otherwise
     """
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = session.exec(_STMT_USER_BY_EMAIL, params={"email": email}).first()
     if not user:
         return None
     if not hasattr(user, 'password_hash') or not user.password_hash:
@@ -182,5 +284,8 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
         return None
     if not verify_password(password, user.password_hash):
         return None
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = hash_password(password)
+        session.add(user)
     return user
 
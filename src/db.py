@@ -1,21 +1,67 @@
 # src/db.py
 from sqlmodel import SQLModel, Session, create_engine
+from sqlalchemy import case, column, delete, event, func, inspect, select, table, update
+from sqlalchemy.orm import sessionmaker
 from contextlib import contextmanager
+from models import AuditAction
 
 # SQLite database URL
 DATABASE_URL = "sqlite:///./boostly.db"
 
 # Create engine
-engine = create_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    connect_args={"check_same_thread": False},
+    pool_size=10,
+    max_overflow=20,
+)
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _):
+    """Use WAL so readers don't block on writers, and fsync less per commit"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+    cursor.close()
+
+# Session factory; objects stay usable after commit without a reload
+SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
 def create_db_and_tables():
-    """Create all database tables"""
+    """Create all database tables, and any indexes missing from existing ones"""
     SQLModel.metadata.create_all(engine)
+    # The old check-then-insert endorse could race and store duplicates, which
+    # would make the unique index fail to build; keep the first of each pair
+    existing = {index["name"] for index in inspect(engine).get_indexes("endorsement")}
+    if "uq_endorsement_recognition_endorser" not in existing:
+        endorsement = table("endorsement", column("id"), column("recognition_id"), column("endorser_id"))
+        first_ids = select(func.min(endorsement.c.id)).group_by(
+            endorsement.c.recognition_id, endorsement.c.endorser_id
+        )
+        with engine.begin() as conn:
+            conn.execute(delete(endorsement).where(endorsement.c.id.not_in(first_ids)))
+    # create_all skips tables that already exist, including their indexes
+    for tbl in SQLModel.metadata.sorted_tables:
+        for index in tbl.indexes:
+            index.create(engine, checkfirst=True)
+    # Audit actions used to be stored by name; rewrite any such rows to codes
+    audit = table("auditlog", column("action"))
+    names = {str(action): int(action) for action in AuditAction}
+    with engine.begin() as conn:
+        conn.execute(
+            update(audit)
+            .where(audit.c.action.in_(list(names)))
+            .values(action=case(names, value=audit.c.action))
+        )
 
 @contextmanager
 def get_session():
     """Context manager for database sessions"""
-    session = Session(engine)
+    session = SessionLocal()
     try:
         yield session
     finally:
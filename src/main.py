@@ -1,65 +1,169 @@
 # src/main.py
 from fastapi import FastAPI, HTTPException, Depends, Query, Request
-from sqlmodel import Session, select, func
-from models import User, Recognition, Endorsement, Redemption, AuditLog
-from datetime import date, timedelta
-from db import get_session, create_db_and_tables
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from sqlmodel import Session, select, func, update, or_, extract
+from sqlalchemy import bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models import User, Recognition, Endorsement, Redemption, AuditLog, AuditAction
+from datetime import date, datetime, timedelta
+from db import create_db_and_tables
 from schemas import (
     CreateUserRequest, RecognizeRequest, RedeemRequest,
     UserResponse, RecognitionResponse, RedemptionResponse,
     EndorsementResponse, LeaderboardEntry, AuditLogResponse,
-    LoginRequest, TokenResponse
+    LoginRequest, TokenResponse, LEADERBOARD_ADAPTER
 )
-from typing import List, Optional
-from audit import log_action, get_client_ip
+from typing import Any, Dict, List, Optional, Tuple, Type
+from functools import lru_cache
+from pydantic import BaseModel, ValidationError
+import orjson
+from audit import log_action, get_client_ip, start_audit_writer, stop_audit_writer
 from auth import (
-    get_current_user, get_current_admin_user,
+    get_current_user, get_current_admin_user, get_db_session,
     create_access_token, authenticate_user, hash_password
 )
 
 app = FastAPI(title="Boostly")
 
+def json_body(model: Type[BaseModel]) -> Any:
+    """
+    Dependency that validates the raw request body with model_validate_json.
+    
+    FastAPI's own body handling json.loads() the bytes into a dict and then
+    validates the dict; parsing straight from bytes skips that intermediate
+    object. Pair with json_body_openapi(model) so the route still documents
+    its request body.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [
+                    {**err, "loc": ("body", *err["loc"])}
+                    for err in e.errors(include_url=False, include_input=False, include_context=False)
+                ]
+            )
+    return Depends(parse)
+
+@lru_cache(maxsize=1024)
+def _validation_error_body(errors: Tuple[Tuple[str, Tuple[Any, ...], str], ...]) -> bytes:
+    """Serialized 422 body for (type, loc, msg) triples; repeats hit the cache."""
+    return orjson.dumps({"detail": [{"type": t, "loc": loc, "msg": msg} for t, loc, msg in errors]})
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """
+    Return 422s with only type, loc and msg per error.
+    
+    Echoing the submitted input and error context back costs a copy per
+    error and varies per request; without them the common failures (bad
+    email, credits out of range) produce identical bodies that are
+    serialized once and cached.
+    """
+    key = tuple((err["type"], tuple(err["loc"]), err["msg"]) for err in exc.errors())
+    return Response(_validation_error_body(key), status_code=422, media_type="application/json")
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body for routes that read their body via json_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}},
+        }
+    }
+
+# Statements for hot endpoints, built once at import and bound per request
+_STMT_EMAIL_TAKEN = select(User.id).where(User.email == bindparam("email"))
+# returns no row if this user already endorsed the recognition
+_STMT_ENDORSE = (
+    sqlite_insert(Endorsement)
+    .values(recognition_id=bindparam("rid"), endorser_id=bindparam("eid"), ts=bindparam("ts"))
+    .on_conflict_do_nothing(index_elements=["recognition_id", "endorser_id"])
+    .returning(Endorsement.id)
+)
+# per-receiver counts, joined onto the users in a single query
+_rec_counts = (
+    select(Recognition.receiver_id, func.count(Recognition.id).label("rc"))
+    .group_by(Recognition.receiver_id)
+    .subquery()
+)
+_end_counts = (
+    select(Recognition.receiver_id, func.count(Endorsement.id).label("ec"))
+    .select_from(Endorsement)
+    .join(Recognition, Endorsement.recognition_id == Recognition.id)
+    .group_by(Recognition.receiver_id)
+    .subquery()
+)
+_STMT_LEADERBOARD = (
+    select(
+        User.id,
+        User.name,
+        User.total_received,
+        func.coalesce(_rec_counts.c.rc, 0).label("recognition_count"),
+        func.coalesce(_end_counts.c.ec, 0).label("endorsement_total"),
+    )
+    .outerjoin(_rec_counts, _rec_counts.c.receiver_id == User.id)
+    .outerjoin(_end_counts, _end_counts.c.receiver_id == User.id)
+    .order_by(User.total_received.desc(), User.id.asc())
+    .limit(bindparam("limit"))
+)
+
 @app.on_event("startup")
 def on_startup():
     create_db_and_tables()
+    start_audit_writer()
 
-@app.post("/register", response_model=UserResponse)
-def register_user(req: CreateUserRequest, request: Request):
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_audit_writer()
+
+@app.post("/register", response_model=UserResponse, openapi_extra=json_body_openapi(CreateUserRequest))
+def register_user(
+    request: Request,
+    req: CreateUserRequest = json_body(CreateUserRequest),
+    s: Session = Depends(get_db_session)
+):
     """Register a new user with email and password."""
-    with get_session() as s:
-        # Check if email already exists
-        existing = s.exec(select(User).where(User.email == req.email)).first()
-        if existing:
-            raise HTTPException(400, "Email already registered")
-        
-        # Hash password
-        password_hash = hash_password(req.password)
-        
-        # Create user
-        u = User(name=req.name, email=req.email, password_hash=password_hash)
-        s.add(u)
-        s.commit()
-        s.refresh(u)
-        
-        # Convert to response model while still in session
-        user_response = UserResponse.model_validate(u)
-        
-        # Audit log
-        log_action(
-            session=s,
-            action="create_user",
-            user_id=None,  # no authenticated user yet
-            entity_type="user",
-            entity_id=u.id,
-            details={"name": u.name, "email": u.email},
-            ip_address=get_client_ip(request)
-        )
-        s.commit()
-        
-    return user_response
+    # Check if email already exists
+    existing = s.exec(_STMT_EMAIL_TAKEN, params={"email": req.email}).first()
+    if existing:
+        raise HTTPException(400, "Email already registered")
+    
+    # Sync handler: FastAPI runs it in the threadpool, so neither the argon2
+    # hash nor the SQLite I/O blocks the event loop
+    password_hash = hash_password(req.password)
+    
+    # Create user
+    u = User(name=req.name, email=req.email, password_hash=password_hash)
+    s.add(u)
+    s.commit()  # u.id is set by the INSERT and nothing expires on commit
+    
+    # Map the response explicitly so password_hash can never be serialized;
+    # u was just written by us, so its fields need no re-validation
+    user_response = UserResponse.from_orm_fast(u)
+    
+    # Audit log
+    log_action(
+        action=AuditAction.CREATE_USER,
+        user_id=None,  # no authenticated user yet
+        entity_type="user",
+        entity_id=u.id,
+        details={"name": u.name, "email": u.email},
+        ip_address=get_client_ip(request)
+    )
+    
+    # Already a validated UserResponse; returning a Response skips FastAPI's
+    # dump-and-revalidate pass against response_model
+    return Response(user_response.model_dump_json(), media_type="application/json")
 
-@app.post("/login", response_model=TokenResponse)
-def login(req: LoginRequest, request: Request):
+@app.post("/login", response_model=TokenResponse, openapi_extra=json_body_openapi(LoginRequest))
+def login(
+    request: Request,
+    req: LoginRequest = json_body(LoginRequest),
+    s: Session = Depends(get_db_session)
+):
     """
     Authenticate user and return JWT access token.
     
@@ -68,242 +172,274 @@ def login(req: LoginRequest, request: Request):
     - role: user role (admin or user)
     - exp: expiration timestamp
     """
-    with get_session() as s:
-        # Authenticate user
-        user = authenticate_user(s, req.email, req.password)
-        if not user:
-            # Audit failed login attempt
-            log_action(
-                session=s,
-                action="login_failed",
-                user_id=None,
-                entity_type="auth",
-                entity_id=None,
-                details={"email": req.email, "reason": "invalid_credentials"},
-                ip_address=get_client_ip(request)
-            )
-            s.commit()
-            raise HTTPException(
-                status_code=401,
-                detail="Incorrect email or password"
-            )
-        
-        # Determine user role
-        role = "admin" if user.id == 1 else "user"
-        
-        # Create access token with claims
-        access_token = create_access_token(
-            data={
-                "sub": str(user.id),  # subject (user_id) must be string
-                "role": role,
-                "email": user.email,
-                "name": user.name
-            },
-            expires_delta=timedelta(hours=24)
-        )
-        
-        # Audit successful login
+    # Authenticate user (sync handler, so verification runs in the threadpool)
+    user = authenticate_user(s, req.email, req.password)
+    if not user:
+        # Audit failed login attempt
         log_action(
-            session=s,
-            action="login_success",
-            user_id=user.id,
+            action=AuditAction.LOGIN_FAILED,
+            user_id=None,
             entity_type="auth",
-            entity_id=user.id,
-            details={"email": user.email, "role": role},
+            entity_id=None,
+            details={"email": req.email, "reason": "invalid_credentials"},
             ip_address=get_client_ip(request)
         )
-        s.commit()
-        
-        return TokenResponse(
-            access_token=access_token,
-            token_type="bearer",
-            user_id=user.id,
-            name=user.name,
-            email=user.email,
-            role=role
+        raise HTTPException(
+            status_code=401,
+            detail="Incorrect email or password"
         )
+    
+    # Determine user role
+    role = "admin" if user.id == 1 else "user"
+    
+    # Create access token with claims
+    access_token = create_access_token(
+        data={
+            "sub": str(user.id),  # subject (user_id) must be string
+            "role": role,
+            "email": user.email,
+            "name": user.name
+        },
+        expires_delta=timedelta(hours=24)
+    )
+    
+    # Audit successful login
+    log_action(
+        action=AuditAction.LOGIN_SUCCESS,
+        user_id=user.id,
+        entity_type="auth",
+        entity_id=user.id,
+        details={"email": user.email, "role": role},
+        ip_address=get_client_ip(request)
+    )
+    s.commit()  # persist a rehashed password, if any
+    
+    return TokenResponse(
+        access_token=access_token,
+        token_type="bearer",
+        user_id=user.id,
+        name=user.name,
+        email=user.email,
+        role=role
+    )
 
-@app.post("/recognize", response_model=RecognitionResponse)
-def recognize(req: RecognizeRequest, request: Request, sender: User = Depends(get_current_user)):
+@app.post("/recognize", response_model=RecognitionResponse, openapi_extra=json_body_openapi(RecognizeRequest))
+def recognize(
+    request: Request,
+    req: RecognizeRequest = json_body(RecognizeRequest),
+    sender: User = Depends(get_current_user),
+    s: Session = Depends(get_db_session)
+):
     if sender.id == req.receiver_id:
         raise HTTPException(400, "Cannot send credits to yourself")
-    with get_session() as s:
-        s.add(sender); s.refresh(sender)  # refresh to latest state
-        if sender.grant_balance < req.credits:
+    # debit the sender only if the limits still hold; the guards live in the
+    # UPDATE so concurrent requests can't both pass a separate read
+    sender_balance_after = s.exec(
+        update(User)
+        .where(
+            User.id == sender.id,
+            User.grant_balance >= req.credits,
+            User.sent_this_month + req.credits <= 100,
+        )
+        .values(
+            grant_balance=User.grant_balance - req.credits,
+            sent_this_month=User.sent_this_month + req.credits,
+        )
+        .returning(User.grant_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if sender_balance_after is None:
+        # sender may be a cached, stale copy; read which guard failed
+        grant_balance = s.exec(select(User.grant_balance).where(User.id == sender.id)).one()
+        if grant_balance < req.credits:
             raise HTTPException(400, "Insufficient grant balance to send")
-        if sender.sent_this_month + req.credits > 100:
-            raise HTTPException(400, "Monthly sending limit exceeded")
-        receiver = s.get(User, req.receiver_id)
-        if not receiver:
-            raise HTTPException(404, "Receiver not found")
-        # create recognition and update balances atomically
-        rec = Recognition(sender_id=sender.id, receiver_id=req.receiver_id, credits=req.credits, note=req.note)
-        s.add(rec)
-        sender.grant_balance -= req.credits
-        sender.sent_this_month += req.credits
-        receiver.redeemable_balance += req.credits
-        receiver.total_received += req.credits
-        s.add(sender); s.add(receiver)
-        s.commit()
-        s.refresh(rec)
-        
-        # Audit log
-        log_action(
-            session=s,
-            action="recognize",
-            user_id=sender.id,
-            entity_type="recognition",
-            entity_id=rec.id,
-            details={
-                "sender_id": sender.id,
-                "receiver_id": req.receiver_id,
-                "receiver_name": receiver.name,
-                "credits": req.credits,
-                "note": req.note,
-                "sender_balance_after": sender.grant_balance,
-                "receiver_balance_after": receiver.redeemable_balance
-            },
-            ip_address=get_client_ip(request)
+        raise HTTPException(400, "Monthly sending limit exceeded")
+    # credit the receiver; raising before commit rolls back the debit
+    receiver = s.exec(
+        update(User)
+        .where(User.id == req.receiver_id)
+        .values(
+            redeemable_balance=User.redeemable_balance + req.credits,
+            total_received=User.total_received + req.credits,
         )
-        s.commit()
-        return RecognitionResponse(status="ok", recognition_id=rec.id)
+        .returning(User.name, User.redeemable_balance)
+        .execution_options(synchronize_session=False)
+    ).one_or_none()
+    if not receiver:
+        raise HTTPException(404, "Receiver not found")
+    rec = Recognition(sender_id=sender.id, receiver_id=req.receiver_id, credits=req.credits, note=req.note or None)
+    s.add(rec)
+    s.commit()
+    
+    # Audit log
+    log_action(
+        action=AuditAction.RECOGNIZE,
+        user_id=sender.id,
+        entity_type="recognition",
+        entity_id=rec.id,
+        details={
+            "sender_id": sender.id,
+            "receiver_id": req.receiver_id,
+            "receiver_name": receiver.name,
+            "credits": req.credits,
+            "note": req.note or None,
+            "sender_balance_after": sender_balance_after,
+            "receiver_balance_after": receiver.redeemable_balance
+        },
+        ip_address=get_client_ip(request)
+    )
+    return RecognitionResponse(status="ok", recognition_id=rec.id)
 
 @app.post("/recognitions/{rec_id}/endorse", response_model=EndorsementResponse)
-def endorse(rec_id: int, request: Request, endorser: User = Depends(get_current_user)):
+def endorse(
+    rec_id: int,
+    request: Request,
+    endorser: User = Depends(get_current_user),
+    s: Session = Depends(get_db_session)
+):
     if rec_id <= 0:
         raise HTTPException(400, "Invalid recognition ID")
-    with get_session() as s:
-        rec = s.get(Recognition, rec_id)
-        if not rec:
-            raise HTTPException(404, "Recognition not found")
-        # check if endorser already endorsed
-        q = select(Endorsement).where(Endorsement.recognition_id == rec_id, Endorsement.endorser_id == endorser.id)
-        existing = s.exec(q).first()
-        if existing:
-            raise HTTPException(400, "Already endorsed")
-        e = Endorsement(recognition_id=rec_id, endorser_id=endorser.id)
-        s.add(e)
-        s.commit()
-        s.refresh(e)
-        
-        # Audit log
-        log_action(
-            session=s,
-            action="endorse",
-            user_id=endorser.id,
-            entity_type="endorsement",
-            entity_id=e.id,
-            details={
-                "recognition_id": rec_id,
-                "endorser_id": endorser.id,
-                "endorser_name": endorser.name
-            },
-            ip_address=get_client_ip(request)
-        )
-        s.commit()
-        return EndorsementResponse(status="ok")
+    rec = s.get(Recognition, rec_id)
+    if not rec:
+        raise HTTPException(404, "Recognition not found")
+    # insert unless the endorser already endorsed it (enforced by a unique index)
+    endorsement_id = s.exec(
+        _STMT_ENDORSE, params={"rid": rec_id, "eid": endorser.id, "ts": datetime.utcnow()}
+    ).scalar_one_or_none()
+    if endorsement_id is None:
+        raise HTTPException(400, "Already endorsed")
+    s.commit()
+    
+    # Audit log
+    log_action(
+        action=AuditAction.ENDORSE,
+        user_id=endorser.id,
+        entity_type="endorsement",
+        entity_id=endorsement_id,
+        details={
+            "recognition_id": rec_id,
+            "endorser_id": endorser.id,
+            "endorser_name": endorser.name
+        },
+        ip_address=get_client_ip(request)
+    )
+    return EndorsementResponse(status="ok")
 
-@app.post("/redeem", response_model=RedemptionResponse)
-def redeem(req: RedeemRequest, request: Request, user: User = Depends(get_current_user)):
-    with get_session() as s:
-        s.add(user); s.refresh(user)
-        if user.redeemable_balance < req.credits:
-            raise HTTPException(400, "Insufficient redeemable balance")
-        user.redeemable_balance -= req.credits
-        voucher_value = req.credits * 5
-        red = Redemption(user_id=user.id, credits=req.credits, value_in_inr=voucher_value)
-        s.add(user); s.add(red)
-        s.commit()
-        s.refresh(red)
-        
-        # Audit log
-        log_action(
-            session=s,
-            action="redeem",
-            user_id=user.id,
-            entity_type="redemption",
-            entity_id=red.id,
-            details={
-                "credits": req.credits,
-                "voucher_inr": voucher_value,
-                "balance_after": user.redeemable_balance
-            },
-            ip_address=get_client_ip(request)
-        )
-        s.commit()
-        return RedemptionResponse(status="ok", voucher_inr=voucher_value)
+@app.post("/redeem", response_model=RedemptionResponse, openapi_extra=json_body_openapi(RedeemRequest))
+def redeem(
+    request: Request,
+    req: RedeemRequest = json_body(RedeemRequest),
+    user: User = Depends(get_current_user),
+    s: Session = Depends(get_db_session)
+):
+    # debit only if the balance covers it, checked in the UPDATE itself so
+    # concurrent redemptions can't overdraw; user may be a cached, stale copy
+    balance_after = s.exec(
+        update(User)
+        .where(User.id == user.id, User.redeemable_balance >= req.credits)
+        .values(redeemable_balance=User.redeemable_balance - req.credits)
+        .returning(User.redeemable_balance)
+        .execution_options(synchronize_session=False)
+    ).scalar_one_or_none()
+    if balance_after is None:
+        raise HTTPException(400, "Insufficient redeemable balance")
+    voucher_value = req.credits * 5
+    red = Redemption(user_id=user.id, credits=req.credits, value_in_inr=voucher_value)
+    s.add(red)
+    s.commit()
+    
+    # Audit log
+    log_action(
+        action=AuditAction.REDEEM,
+        user_id=user.id,
+        entity_type="redemption",
+        entity_id=red.id,
+        details={
+            "credits": req.credits,
+            "voucher_inr": voucher_value,
+            "balance_after": balance_after
+        },
+        ip_address=get_client_ip(request)
+    )
+    return RedemptionResponse(status="ok", voucher_inr=voucher_value)
 
 @app.post("/admin/reset_month")
-def reset_month(request: Request, admin_user: User = Depends(get_current_admin_user)):
+def reset_month(
+    request: Request,
+    admin_claims: dict = Depends(get_current_admin_user),
+    s: Session = Depends(get_db_session)
+):
+    admin_id = int(admin_claims["sub"])
     today = date.today()
-    with get_session() as s:
-        users = s.exec(select(User)).all()
-        reset_count = 0
-        user_details = []
-        
-        for u in users:
-            # only reset if not reset today (or month)
-            if u.last_reset_date and u.last_reset_date.month == today.month and u.last_reset_date.year == today.year:
-                continue
-            unused = max(0, u.grant_balance)
-            carry = min(50, unused)
-            old_balance = u.grant_balance
-            u.grant_balance = 100 + carry
-            u.sent_this_month = 0
-            u.last_reset_date = today
-            s.add(u)
-            reset_count += 1
-            user_details.append({
-                "user_id": u.id,
-                "old_balance": old_balance,
-                "new_balance": u.grant_balance,
-                "carry_forward": carry
-            })
-        
-        s.commit()
-        
-        # Audit log
-        log_action(
-            session=s,
-            action="reset_month",
-            user_id=admin_user.id,
-            entity_type="system",
-            entity_id=None,
-            details={
-                "reset_date": today.isoformat(),
-                "users_reset": reset_count,
-                "admin_id": admin_user.id,
-                "admin_name": admin_user.name,
-                "user_resets": user_details
-            },
-            ip_address=get_client_ip(request)
+    # only reset users not already reset this month
+    needs_reset = or_(
+        User.last_reset_date.is_(None),
+        extract("month", User.last_reset_date) != today.month,
+        extract("year", User.last_reset_date) != today.year,
+    )
+    
+    # Take SQLite's write lock before the snapshot (pysqlite would only BEGIN
+    # at the UPDATE), so no commit can land between it and the reset and the
+    # audit trail records exactly the balances that were reset
+    s.connection().exec_driver_sql("BEGIN IMMEDIATE")
+    # Snapshot balances for the audit trail, then reset everyone in one UPDATE
+    old_balances = s.exec(select(User.id, User.grant_balance).where(needs_reset)).all()
+    result = s.exec(
+        update(User)
+        .where(needs_reset)
+        .values(
+            grant_balance=100 + func.min(50, func.max(0, User.grant_balance)),
+            sent_this_month=0,
+            last_reset_date=today,
         )
-        s.commit()
+        .execution_options(synchronize_session=False)
+    )
+    s.commit()
+    reset_count = result.rowcount
+    
+    # Serialize the audit payload directly; with many users the per-user
+    # resets are compact [user_id, old_balance, new_balance, carry_forward] rows
+    user_resets = []
+    for user_id, old_balance in old_balances:
+        carry = min(50, max(0, old_balance))
+        user_resets.append((user_id, old_balance, 100 + carry, carry))
+    details_json = orjson.dumps({
+        "reset_date": today,
+        "users_reset": reset_count,
+        "admin_id": admin_id,
+        "admin_name": admin_claims.get("name"),
+        "user_resets": user_resets
+    })
+    
+    # Audit log
+    log_action(
+        action=AuditAction.RESET_MONTH,
+        user_id=admin_id,
+        entity_type="system",
+        entity_id=None,
+        details_json=details_json,
+        ip_address=get_client_ip(request)
+    )
     return {"status":"ok", "users_reset": reset_count}
 
 @app.get("/leaderboard", response_model=List[LeaderboardEntry])
-def leaderboard(limit: int = Query(default=10, gt=0, le=100)):
-    with get_session() as s:
-        users = s.exec(select(User).order_by(User.total_received.desc(), User.id.asc()).limit(limit)).all()
-        result = []
-        for u in users:
-            rec_count = s.exec(select(func.count(Recognition.id)).where(Recognition.receiver_id == u.id)).first()
-            end_count = s.exec(
-                select(func.count(Endorsement.id)).join(Recognition, Endorsement.recognition_id == Recognition.id).where(Recognition.receiver_id == u.id)
-            ).first()
-            result.append(LeaderboardEntry(
-                id=u.id, name=u.name, total_received=u.total_received,
-                recognition_count=rec_count or 0, endorsement_total=end_count or 0
-            ))
-        return result
+def leaderboard(
+    limit: int = Query(default=10, gt=0, le=100),
+    s: Session = Depends(get_db_session)
+):
+    rows = s.exec(_STMT_LEADERBOARD, params={"limit": limit}).all()
+    entries = [LeaderboardEntry.from_orm_fast(row) for row in rows]
+    return Response(LEADERBOARD_ADAPTER.dump_json(entries), media_type="application/json")
 
 @app.get("/admin/audit-logs", response_model=List[AuditLogResponse])
 def get_audit_logs(
-    admin_user: User = Depends(get_current_admin_user),
+    admin_claims: dict = Depends(get_current_admin_user),
     limit: int = Query(default=100, gt=0, le=1000),
     action: Optional[str] = Query(default=None, description="Filter by action type"),
     user_id: Optional[int] = Query(default=None, description="Filter by user ID"),
-    entity_type: Optional[str] = Query(default=None, description="Filter by entity type")
+    entity_type: Optional[str] = Query(default=None, description="Filter by entity type"),
+    cursor: Optional[int] = Query(default=None, gt=0, description="Only return logs with an ID below this one"),
+    s: Session = Depends(get_db_session)
 ):
     """
     Get audit logs. Admin only endpoint.
@@ -313,35 +449,41 @@ def get_audit_logs(
     - action: Filter by action type (e.g., "recognize", "redeem", "reset_month")
     - user_id: Filter by user who performed the action
     - entity_type: Filter by entity type (e.g., "recognition", "redemption")
+    - cursor: Keyset pagination; pass the last ID of the previous page
+    
+    Logs are returned newest first, ordered by ID.
     """
     
-    with get_session() as s:
-        # Build query with filters
-        query = select(AuditLog).order_by(AuditLog.ts.desc())
-        
-        if action:
-            query = query.where(AuditLog.action == action)
-        if user_id:
-            query = query.where(AuditLog.user_id == user_id)
-        if entity_type:
-            query = query.where(AuditLog.entity_type == entity_type)
-        
-        query = query.limit(limit)
-        
-        logs = s.exec(query).all()
-        
-        # Convert to response format
-        result = []
-        for log in logs:
-            result.append(AuditLogResponse(
-                id=log.id,
-                user_id=log.user_id,
-                action=log.action,
-                entity_type=log.entity_type,
-                entity_id=log.entity_id,
-                details=log.details,
-                ip_address=log.ip_address,
-                ts=log.ts.isoformat()
-            ))
-        
-        return result
+    # Build query with filters
+    query = select(AuditLog).order_by(AuditLog.id.desc())
+    
+    if cursor:
+        query = query.where(AuditLog.id < cursor)
+    if action:
+        try:
+            query = query.where(AuditLog.action == AuditAction.parse(action))
+        except ValueError:
+            return ORJSONResponse([])  # no log can have an unknown action
+    if user_id:
+        query = query.where(AuditLog.user_id == user_id)
+    if entity_type:
+        query = query.where(AuditLog.entity_type == entity_type)
+    
+    # Stream rows in chunks instead of materializing every ORM object first
+    query = query.limit(limit).execution_options(yield_per=200)
+    
+    # Rows come from our own table, so build the AuditLogResponse-shaped dicts
+    # directly and let orjson serialize them (ts included) without a Pydantic pass
+    return ORJSONResponse([
+        {
+            "id": log.id,
+            "user_id": log.user_id,
+            "action": str(log.action),  # name, not the stored code
+            "entity_type": log.entity_type,
+            "entity_id": log.entity_id,
+            "details": log.details,
+            "ip_address": log.ip_address,
+            "ts": log.ts,
+        }
+        for log in s.exec(query)
+    ])
@@ -1,6 +1,61 @@
-from sqlmodel import SQLModel, Field, Relationship, Column, JSON
-from typing import Optional, List, Dict, Any
+from sqlmodel import SQLModel, Field, Relationship, Column, Index
+from sqlalchemy import SmallInteger, Text, TypeDecorator
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime, date
+from enum import IntEnum
+import orjson
+
+class ORJSONType(TypeDecorator):
+    """JSON column stored as text, serialized with orjson instead of stdlib json."""
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if isinstance(value, bytes):
+            return value.decode()  # already serialized by the caller
+        return orjson.dumps(value).decode()
+
+    def process_result_value(self, value, dialect):
+        return orjson.loads(value) if value else None
+
+class AuditAction(IntEnum):
+    """Audit log action, stored as a small integer and shown by its lowercase name."""
+    CREATE_USER = 1
+    RECOGNIZE = 2
+    REDEEM = 3
+    RESET_MONTH = 4
+    ENDORSE = 5
+    LOGIN_SUCCESS = 6
+    LOGIN_FAILED = 7
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+    @classmethod
+    def parse(cls, value: Union["AuditAction", int, str]) -> "AuditAction":
+        """Accept a member, its code (int or digit string) or its name ("recognize")."""
+        if isinstance(value, str):
+            if value.isdigit():
+                return cls(int(value))
+            try:
+                return cls[value.upper()]
+            except KeyError:
+                raise ValueError(f"Unknown audit action: {value!r}") from None
+        return cls(value)
+
+class AuditActionType(TypeDecorator):
+    """AuditAction column stored as SMALLINT; names and codes are accepted on bind."""
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else int(AuditAction.parse(value))
+
+    def process_result_value(self, value, dialect):
+        # codes read back as text from databases where the column predates this type
+        return None if value is None else AuditAction.parse(value)
 
 class User(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -20,12 +75,18 @@ class User(SQLModel, table=True):
 class Recognition(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     sender_id: int
-    receiver_id: int
+    receiver_id: int = Field(index=True)
     credits: int
     note: Optional[str] = None
     ts: datetime = Field(default_factory=datetime.utcnow)
 
 class Endorsement(SQLModel, table=True):
+    # one endorsement per user per recognition; a unique index rather than a
+    # constraint so create_db_and_tables() can add it to existing databases
+    __table_args__ = (
+        Index("uq_endorsement_recognition_endorser", "recognition_id", "endorser_id", unique=True),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     recognition_id: int
     endorser_id: int
@@ -40,10 +101,13 @@ class Redemption(SQLModel, table=True):
 
 class AuditLog(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    user_id: Optional[int] = None  # user who performed the action (None for system actions)
-    action: str  # action name: "create_user", "recognize", "endorse", "redeem", "reset_month"
-    entity_type: Optional[str] = None  # "user", "recognition", "endorsement", "redemption"
+    user_id: Optional[int] = Field(default=None, index=True)  # user who performed the action (None for system actions)
+    action: AuditAction = Field(sa_column=Column(AuditActionType, nullable=False, index=True))
+    entity_type: Optional[str] = Field(default=None, index=True)  # "user", "recognition", "endorsement", "redemption"
     entity_id: Optional[int] = None  # ID of the affected entity
-    details: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))  # additional context
+    details: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(ORJSONType))  # additional context
     ip_address: Optional[str] = None
     ts: datetime = Field(default_factory=datetime.utcnow)
+
+# leaderboard ordering (total_received DESC, id ASC)
+Index("ix_user_leaderboard", User.total_received.desc(), User.id)
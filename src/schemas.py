@@ -1,29 +1,64 @@
 # src/schemas.py
-from pydantic import BaseModel, Field, EmailStr, validator
-from typing import Optional
+from pydantic import (
+    AfterValidator, BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter,
+    field_serializer, field_validator
+)
+from pydantic_core import PydanticCustomError
+from typing import Annotated, Any, Dict, List, Optional, Self, Tuple, Union
+from datetime import datetime
+from models import AuditAction
+from functools import lru_cache
+import re
+import unicodedata
+import email_validator
+
+# Cheap syntactic check for login, where the address is only looked up; the
+# full email-validator check is kept for registration
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+def _normalize_login_email(value: str) -> str:
+    """Normalize like email-validator does at registration (NFC, lowercase domain)."""
+    local, _, domain = unicodedata.normalize("NFC", value).rpartition("@")
+    return f"{local}@{domain.lower()}"
+
+@lru_cache(maxsize=4096)
+def _validate_email_cached(raw: str) -> str:
+    """EmailStr's check and normalization, memoized on the raw string."""
+    try:
+        return email_validator.validate_email(raw, check_deliverability=False).normalized
+    except email_validator.EmailNotValidError as e:
+        raise PydanticCustomError(
+            "value_error", "value is not a valid email address: {reason}", {"reason": str(e)}
+        )
 
 class CreateUserRequest(BaseModel):
-    name: str = Field(..., min_length=1, max_length=100, description="User's full name")
-    email: EmailStr = Field(..., description="User's email address")
-    password: str = Field(..., min_length=8, max_length=100, description="User's password (min 8 chars)")
-
-    @validator('name')
-    def name_must_not_be_empty(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Name cannot be empty or whitespace')
-        return v.strip()
-    
-    @validator('password')
-    def password_must_be_strong(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)] = Field(
+        ..., description="User's full name"
+    )
+    email: Annotated[str, AfterValidator(_validate_email_cached)] = Field(
+        ..., description="User's email address", json_schema_extra={"format": "email"}
+    )
+    # repr=False/exclude=True keep the plaintext out of reprs and model_dump()
+    password: str = Field(
+        ..., min_length=8, max_length=100, repr=False, exclude=True,
+        description="User's password (min 8 chars)",
+        json_schema_extra={"format": "password", "writeOnly": True}
+    )
 
 class LoginRequest(BaseModel):
-    email: EmailStr = Field(..., description="User's email address")
+    # Normalized so the lookup matches the stored address (e.g. a mixed-case domain)
+    email: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, pattern=_EMAIL_RE.pattern, max_length=254),
+        AfterValidator(_normalize_login_email),
+    ] = Field(..., description="User's email address")
     password: str = Field(..., description="User's password")
 
 class TokenResponse(BaseModel):
+    # Response models declare empty __slots__ so instances carry no
+    # __weakref__ slot; pydantic itself still keeps field values in __dict__
+    __slots__ = ()
+
     access_token: str
     token_type: str = "bearer"
     user_id: int
@@ -34,20 +69,18 @@ class TokenResponse(BaseModel):
 class RecognizeRequest(BaseModel):
     receiver_id: int = Field(..., gt=0, description="ID of the user receiving recognition")
     credits: int = Field(..., gt=0, le=100, description="Number of credits to send (1-100)")
-    note: Optional[str] = Field(None, max_length=500, description="Optional message")
-
-    @validator('note')
-    def note_must_be_valid(cls, v):
-        if v is not None:
-            v = v.strip()
-            if not v:
-                return None
-        return v
+    # A whitespace-only note strips to "", which the handler stores as None
+    note: Optional[Annotated[str, StringConstraints(strip_whitespace=True, max_length=500)]] = Field(
+        None, description="Optional message"
+    )
 
 class RedeemRequest(BaseModel):
     credits: int = Field(..., gt=0, le=10000, description="Number of credits to redeem")
 
 class UserResponse(BaseModel):
+    __slots__ = ()
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     email: str
@@ -56,37 +89,112 @@ class UserResponse(BaseModel):
     redeemable_balance: int
     total_received: int
 
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_orm_fast(cls, obj: Any) -> Self:
+        """Build from a trusted User row without validation (model_construct)."""
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            email=obj.email,
+            grant_balance=obj.grant_balance,
+            sent_this_month=obj.sent_this_month,
+            redeemable_balance=obj.redeemable_balance,
+            total_received=obj.total_received,
+        )
 
 class RecognitionResponse(BaseModel):
+    __slots__ = ()
+
     status: str
     recognition_id: int
 
 class RedemptionResponse(BaseModel):
+    __slots__ = ()
+
     status: str
     voucher_inr: int
 
 class EndorsementResponse(BaseModel):
+    __slots__ = ()
+
     status: str
 
 class LeaderboardEntry(BaseModel):
+    __slots__ = ()
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     name: str
     total_received: int
     recognition_count: int
     endorsement_total: int
 
+    @classmethod
+    def from_orm_fast(cls, obj: Any) -> Self:
+        """Build from a trusted leaderboard row without validation (model_construct)."""
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            total_received=obj.total_received,
+            recognition_count=obj.recognition_count,
+            endorsement_total=obj.endorsement_total,
+        )
+
+class _AuditDetails(BaseModel):
+    # Rows may carry keys beyond the declared ones (e.g. written by older code)
+    model_config = ConfigDict(extra="allow")
+
+class RecognizeDetails(_AuditDetails):
+    sender_id: int
+    receiver_id: int
+    receiver_name: Optional[str] = None
+    credits: int
+    note: Optional[str] = None
+    sender_balance_after: int
+    receiver_balance_after: int
+
+class RedeemDetails(_AuditDetails):
+    credits: int
+    voucher_inr: int
+    balance_after: int
+
+class ResetMonthDetails(_AuditDetails):
+    reset_date: str
+    users_reset: int
+    admin_id: int
+    admin_name: str
+    # (user_id, old, new, carry); rows written before the tuple form hold
+    # {"user_id", "old_balance", "new_balance", "carry_forward"} dicts
+    user_resets: Optional[List[Union[Tuple[int, int, int, int], Dict[str, int]]]] = None
+
+class EndorseDetails(_AuditDetails):
+    recognition_id: int
+    endorser_id: int
+    endorser_name: Optional[str] = None
+
 class AuditLogResponse(BaseModel):
+    __slots__ = ()
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     user_id: Optional[int]
-    action: str
+    action: AuditAction  # serialized by name, e.g. "recognize"
     entity_type: Optional[str]
     entity_id: Optional[int]
-    details: Optional[dict]
+    # Documents the details shape per action in the OpenAPI schema; actions
+    # without a model (create_user, login_*) carry a plain dict
+    details: Optional[Union[RecognizeDetails, RedeemDetails, ResetMonthDetails, EndorseDetails, Dict[str, Any]]]
     ip_address: Optional[str]
-    ts: str  # ISO format datetime string
-    
-    class Config:
-        from_attributes = True
+    ts: datetime  # serialized as an ISO 8601 string
+
+    @field_validator("action", mode="before")
+    @classmethod
+    def parse_action(cls, v: Any) -> AuditAction:
+        return AuditAction.parse(v)
+
+    @field_serializer("action")
+    def serialize_action(self, action: AuditAction) -> str:
+        return str(action)
 
+# Built once at import so every request reuses the compiled serializer
+LEADERBOARD_ADAPTER = TypeAdapter(list[LeaderboardEntry])
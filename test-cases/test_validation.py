@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 """Test script to verify Pydantic validation is working"""
 
+import sys
+sys.path.insert(0, 'src')
+
 from schemas import CreateUserRequest, RecognizeRequest, RedeemRequest
 from pydantic import ValidationError
 
@@ -9,28 +12,28 @@ def test_create_user_validation():
     
     # Valid user
     try:
-        valid_user = CreateUserRequest(name="John Doe", email="john@example.com")
+        valid_user = CreateUserRequest(name="John Doe", email="john@example.com", password="securepass123")
         print(f"✓ Valid user: {valid_user.name}, {valid_user.email}")
     except ValidationError as e:
         print(f"✗ Unexpected error: {e}")
     
     # Invalid email
     try:
-        CreateUserRequest(name="John Doe", email="invalid-email")
+        CreateUserRequest(name="John Doe", email="invalid-email", password="securepass123")
         print("✗ Should have failed with invalid email")
     except ValidationError as e:
         print(f"✓ Correctly rejected invalid email: {e.errors()[0]['msg']}")
     
     # Empty name
     try:
-        CreateUserRequest(name="   ", email="john@example.com")
+        CreateUserRequest(name="   ", email="john@example.com", password="securepass123")
         print("✗ Should have failed with empty name")
     except ValidationError as e:
         print(f"✓ Correctly rejected empty name: {e.errors()[0]['msg']}")
     
     # Name too long
     try:
-        CreateUserRequest(name="A" * 101, email="john@example.com")
+        CreateUserRequest(name="A" * 101, email="john@example.com", password="securepass123")
         print("✗ Should have failed with name too long")
     except ValidationError as e:
         print(f"✓ Correctly rejected name too long: {e.errors()[0]['msg']}")